@@ -24,13 +24,25 @@ at https://cloud.google.com/cdn/docs.
 import argparse
 import base64
 import datetime
-import hashlib
+import functools
 import hmac
 
 from six.moves import urllib
 
 
 # [START sign_url]
+# [START cdn_sign_cookie]
+# expiration times are naive UTC datetimes, so they are measured from a naive epoch
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=64)
+def _decode_key(base64_key):
+    """Decodes the base64 signing key, caching it per key string."""
+    return base64.urlsafe_b64decode(base64_key)
+# [END cdn_sign_cookie]
+
+
 def sign_url(url, key_name, base64_key, expiration_time):
     """Gets the Signed URL string for the specified URL and configuration.
 
@@ -46,22 +58,18 @@ def sign_url(url, key_name, base64_key, expiration_time):
     """
     stripped_url = url.strip()
     parsed_url = urllib.parse.urlsplit(stripped_url)
-    query_params = urllib.parse.parse_qs(
-        parsed_url.query, keep_blank_values=True)
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+    decoded_key = _decode_key(base64_key)
 
     url_pattern = u'{url}{separator}Expires={expires}&KeyName={key_name}'
 
     url_to_sign = url_pattern.format(
             url=stripped_url,
-            separator='&' if query_params else '?',
+            separator='&' if parsed_url.query else '?',
             expires=expiration_timestamp,
             key_name=key_name)
 
-    digest = hmac.new(
-        decoded_key, url_to_sign.encode('utf-8'), hashlib.sha1).digest()
+    digest = hmac.digest(decoded_key, url_to_sign.encode('utf-8'), 'sha1')
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
 
     signed_url = u'{url}&Signature={signature}'.format(
@@ -86,13 +94,10 @@ def sign_url_prefix(url, url_prefix, key_name, base64_key, expiration_time):
     """
     stripped_url = url.strip()
     parsed_url = urllib.parse.urlsplit(stripped_url)
-    query_params = urllib.parse.parse_qs(
-        parsed_url.query, keep_blank_values=True)
     encoded_url_prefix = base64.urlsafe_b64encode(
             url_prefix.strip().encode('utf-8')).decode('utf-8')
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+    decoded_key = _decode_key(base64_key)
 
     policy_pattern = u'URLPrefix={encoded_url_prefix}&Expires={expires}&KeyName={key_name}'
     policy = policy_pattern.format(
@@ -100,13 +105,12 @@ def sign_url_prefix(url, url_prefix, key_name, base64_key, expiration_time):
             expires=expiration_timestamp,
             key_name=key_name)
 
-    digest = hmac.new(
-            decoded_key, policy.encode('utf-8'), hashlib.sha1).digest()
+    digest = hmac.digest(decoded_key, policy.encode('utf-8'), 'sha1')
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
 
     signed_url = u'{url}{separator}{policy}&Signature={signature}'.format(
             url=stripped_url,
-            separator='&' if query_params else '?',
+            separator='&' if parsed_url.query else '?',
             policy=policy,
             signature=signature)
 
@@ -129,9 +133,8 @@ def sign_cookie(url_prefix, key_name, base64_key, expiration_time):
     """
     encoded_url_prefix = base64.urlsafe_b64encode(
             url_prefix.strip().encode('utf-8')).decode('utf-8')
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+    decoded_key = _decode_key(base64_key)
 
     policy_pattern = u'URLPrefix={encoded_url_prefix}:Expires={expires}:KeyName={key_name}'
     policy = policy_pattern.format(
@@ -139,8 +142,7 @@ def sign_cookie(url_prefix, key_name, base64_key, expiration_time):
             expires=expiration_timestamp,
             key_name=key_name)
 
-    digest = hmac.new(
-            decoded_key, policy.encode('utf-8'), hashlib.sha1).digest()
+    digest = hmac.digest(decoded_key, policy.encode('utf-8'), 'sha1')
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
 
     signed_policy = u'Cloud-CDN-Cookie={policy}:Signature={signature}'.format(
@@ -15,19 +15,49 @@
 # [START composer_cicd_deploy_dags_from_diff_utility]
 
 import argparse
+import base64
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+import functools
 import glob
 import os
 import git
-from pathlib import Path
 from shutil import copytree, ignore_patterns
 import tempfile
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 # Imports the Google Cloud client library
 from google.cloud import storage
+import google_crc32c
 
+UPLOAD_MAX_WORKERS = 10
 
-def create_dags_list_from_git_diff(dag_dir: str, repo_root: str, main_branch_name: str) -> List[Path]:
+
+@functools.lru_cache(maxsize=4)
+def _get_repo(repo_root: str) -> git.Repo:
+    return git.Repo(repo_root)
+
+
+def _iter_diff_paths(repo: git.Repo, main_branch_name: str) -> Iterator[str]:
+    # diff against the fork point from the main branch so upstream changes are ignored,
+    # and only list the names of added/copied/modified/renamed files, NUL separated
+    # so that paths containing whitespace survive; git skips patch generation
+    proc = repo.git.diff(
+        main_branch_name, merge_base=True, name_only=True, diff_filter="ACMR", z=True, as_process=True
+    )
+    try:
+        # read the output as it is produced rather than buffering all of it
+        pending = b""
+        for chunk in iter(lambda: proc.stdout.read(64 * 1024), b""):
+            *paths, pending = (pending + chunk).split(b"\x00")
+            for path in paths:
+                yield path.decode("utf-8")
+    finally:
+        proc.stdout.close()
+        # raises GitCommandError if git exited with an error
+        proc.wait()
+
+
+def create_dags_list_from_git_diff(dag_dir: str, repo_root: str, main_branch_name: str) -> List[str]:
     """
     get the list of files within the DAG dir that have changed in the latest git commits against the specified branch
     :param dag_dir:
@@ -35,33 +65,62 @@ def create_dags_list_from_git_diff(dag_dir: str, repo_root: str, main_branch_nam
     :param main_branch_name:
     :return:
     """
-    repo = git.Repo(repo_root)
-    diff_results = repo.git.diff(main_branch_name)
-    # print(diff_results)
-    p = Path(repo_root)
+    repo = _get_repo(repo_root)
     changed_file_list = list()
-    for diff_result_line in diff_results.split("\n"):
-        # test if changed
-        if "+++ b" in diff_result_line and dag_dir in diff_result_line:
-            changed_path = p / Path(diff_result_line[6:])
+    for diff_path in _iter_diff_paths(repo, main_branch_name):
+        if dag_dir in diff_path:
+            # plain string paths, the uploader only needs the file name and location
+            changed_path = os.path.join(repo_root, diff_path)
             print(changed_path)
             changed_file_list.append(changed_path)
-            # print(changed_path.resolve())
     return changed_file_list
 
 
-def upload_changed_dags_to_composer(dag_list: List[Path], bucket_name: str) -> None:
+def _local_crc32c(dag_path: str) -> str:
+    # GCS reports crc32c as the base64 encoding of the big-endian checksum
+    checksum = google_crc32c.Checksum()
+    with open(dag_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            checksum.update(chunk)
+    return base64.b64encode(checksum.digest()).decode("utf-8")
+
+
+def _upload_dag(bucket: storage.Bucket, dag_path: str) -> None:
+    dag_name = os.path.basename(dag_path)
+    blob = bucket.blob(dag_name)
+    blob.upload_from_filename(dag_path)
+    print(f"File {dag_name} uploaded to {bucket.name}/{dag_name}.")
+
+
+def upload_changed_dags_to_composer(dag_list: List[str], bucket_name: str) -> None:
     """
     list of DAGs to upload to Commposer
+    DAGs whose contents already match the object in the bucket are skipped,
+    the remaining uploads are network bound so they run from a thread pool
     :param dag_list:
     :return:
     """
     storage_client = storage.Client()
     bucket = storage_client.bucket(bucket_name)
+    # DAGs are uploaded to the top level of the bucket, so a single delimited
+    # listing returns the checksums of every object they could overwrite
+    remote_checksums = {
+        blob.name: blob.crc32c for blob in storage_client.list_blobs(bucket_name, delimiter="/")
+    }
+    dags_to_upload = list()
     for dag_path in dag_list:
-        blob = bucket.blob(dag_path.name)
-        blob.upload_from_filename(str(dag_path))
-        print(f"File {dag_path.name} uploaded to {bucket_name}/{dag_path.name}.")
+        dag_name = os.path.basename(dag_path)
+        if remote_checksums.get(dag_name) == _local_crc32c(dag_path):
+            print(f"File {dag_name} is unchanged in {bucket_name}, skipping.")
+        else:
+            dags_to_upload.append(dag_path)
+
+    with ThreadPoolExecutor(max_workers=UPLOAD_MAX_WORKERS) as executor:
+        futures = [executor.submit(_upload_dag, bucket, dag_path) for dag_path in dags_to_upload]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in done:
+            # surface the first failed upload instead of silently dropping it
+            future.result()
 
 
 if __name__ == "__main__":
@@ -89,9 +148,10 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    dag_list = create_dags_list_from_git_diff(args.dags_directory, args.repo_root, args.repo_main)
+    dag_list = create_dags_list_from_git_diff(args.dags_directory, args.dag_repo, args.repo_main)
 
-    if len(dag_list)==0:
+    # only create a storage client when there is something to upload
+    if not dag_list:
         print("No DAGs to upload")
     else:
         upload_changed_dags_to_composer(dag_list=dag_list, bucket_name=args.dags_bucket)
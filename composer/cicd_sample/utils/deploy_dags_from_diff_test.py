@@ -17,6 +17,7 @@ import os
 import pathlib
 from shutil import copytree
 import tempfile
+from unittest import mock
 import uuid
 import git
 
@@ -52,7 +53,7 @@ def test_create_dags_list_with_changes() -> None:
         full_dag_dir_str, full_repo_root_str, REPO_MAIN)
     print(dag_list)
     assert len(dag_list) > 0
-    assert "example2_dag.py" in dag_list[0].name
+    assert "example2_dag.py" in os.path.basename(dag_list[0])
     # cleanup - uncomment once test dev is done
     # repo.git.checkout(REPO_MAIN)
 
@@ -68,3 +69,42 @@ def test_create_dags_list_no_changes() -> None:
         full_dag_dir_str, full_repo_root_str, REPO_MAIN)
     assert len(dag_list) == 0
 
+
+def test_upload_skips_unchanged_dags(tmp_path: pathlib.Path) -> None:
+    """
+    this test checks that only DAGs whose CRC32C differs from the bucket are uploaded
+    :return:
+    """
+    unchanged_dag = tmp_path / "unchanged_dag.py"
+    unchanged_dag.write_text("# unchanged\n")
+    changed_dag = tmp_path / "changed_dag.py"
+    changed_dag.write_text("# changed\n")
+    remote_blob = mock.Mock(crc32c=deploy_dags_from_diff._local_crc32c(str(unchanged_dag)))
+    remote_blob.name = "unchanged_dag.py"
+    storage_client = mock.MagicMock()
+    storage_client.list_blobs.return_value = [remote_blob]
+    bucket = storage_client.bucket.return_value
+
+    with mock.patch.object(deploy_dags_from_diff.storage, "Client", return_value=storage_client):
+        deploy_dags_from_diff.upload_changed_dags_to_composer(
+            [str(unchanged_dag), str(changed_dag)], "test-bucket")
+
+    bucket.blob.assert_called_once_with("changed_dag.py")
+    bucket.blob.return_value.upload_from_filename.assert_called_once_with(str(changed_dag))
+
+
+def test_upload_raises_failed_upload(tmp_path: pathlib.Path) -> None:
+    """
+    this test checks that an upload failing in the thread pool is raised to the caller
+    :return:
+    """
+    dag = tmp_path / "failing_dag.py"
+    dag.write_text("# failing\n")
+    storage_client = mock.MagicMock()
+    storage_client.list_blobs.return_value = []
+    storage_client.bucket.return_value.blob.return_value.upload_from_filename.side_effect = (
+        RuntimeError("upload failed"))
+
+    with mock.patch.object(deploy_dags_from_diff.storage, "Client", return_value=storage_client):
+        with pytest.raises(RuntimeError, match="upload failed"):
+            deploy_dags_from_diff.upload_changed_dags_to_composer([str(dag)], "test-bucket")
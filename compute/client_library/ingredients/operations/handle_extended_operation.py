@@ -63,8 +63,8 @@ def wait_for_extended_operation(
 
     if operation.warnings:
         print(f"Warnings during {verbose_name}:\n", file=sys.stderr, flush=True)
-        for warning in operation.warnings:
-            print(f" - {warning.code}: {warning.message}", file=sys.stderr, flush=True)
+        sys.stderr.write("".join(f" - {warning.code}: {warning.message}\n" for warning in operation.warnings))
+        sys.stderr.flush()
 
     return result
 # </INGREDIENT>
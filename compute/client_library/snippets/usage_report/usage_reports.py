@@ -32,7 +32,6 @@ from typing import Any
 from google.api_core.extended_operation import ExtendedOperation
 from google.cloud import compute_v1
 
-
 # [END compute_usage_report_disable]
 # [END compute_usage_report_get]
 # [END compute_usage_report_set]
@@ -83,8 +82,13 @@ def wait_for_extended_operation(
 
     if operation.warnings:
         print(f"Warnings during {verbose_name}:\n", file=sys.stderr, flush=True)
-        for warning in operation.warnings:
-            print(f" - {warning.code}: {warning.message}", file=sys.stderr, flush=True)
+        sys.stderr.write(
+            "".join(
+                f" - {warning.code}: {warning.message}\n"
+                for warning in operation.warnings
+            )
+        )
+        sys.stderr.flush()
 
     return result
 
@@ -127,6 +131,7 @@ def set_usage_export_bucket(
 
 # [END compute_usage_report_set]
 
+
 # [START compute_usage_report_get]
 def get_usage_export_bucket(project_id: str) -> compute_v1.UsageExportLocation:
     """
@@ -210,8 +215,13 @@ def wait_for_extended_operation(
 
     if operation.warnings:
         print(f"Warnings during {verbose_name}:\n", file=sys.stderr, flush=True)
-        for warning in operation.warnings:
-            print(f" - {warning.code}: {warning.message}", file=sys.stderr, flush=True)
+        sys.stderr.write(
+            "".join(
+                f" - {warning.code}: {warning.message}\n"
+                for warning in operation.warnings
+            )
+        )
+        sys.stderr.flush()
 
     return result
 
@@ -25,12 +25,24 @@ at https://cloud.google.com/media-cdn/docs.
 # [START mediacdn_sign_cookie]
 import base64
 import datetime
+import functools
+from typing import List
 
 import cryptography.hazmat.primitives.asymmetric.ed25519 as ed25519
 
 
 from six.moves import urllib
 
+# expiration times are naive UTC datetimes, so they are measured from a naive epoch
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_ed25519_key(base64_key: str) -> ed25519.Ed25519PrivateKey:
+    """Loads the signing key once per key string, so batch signing reuses it."""
+    return ed25519.Ed25519PrivateKey.from_private_bytes(
+        base64.urlsafe_b64decode(base64_key))
+
 # [END mediacdn_sign_cookie]
 # [END mediacdn_sign_url]
 
@@ -49,29 +61,40 @@ def sign_url(url: str, key_name: str, base64_key: str, expiration_time: datetime
         Returns the Signed URL appended with the query parameters based on the
         specified configuration.
     """
+    return sign_urls_batch([url], key_name, base64_key, expiration_time)[0]
+
+
+def sign_urls_batch(urls: List[str], key_name: str, base64_key: str, expiration_time: datetime.datetime) -> List[str]:
+    """Gets the Signed URL strings for several URLs sharing one configuration.
+
+    The signing key and expiration timestamp are prepared once and reused
+    for every URL.
+
+    Args:
+        urls: URLs to sign as a list of strings.
+        key_name: name of the signing key as a string.
+        base64_key: signing key as a base64 encoded byte string.
+        expiration_time: expiration time as a UTC datetime object.
+
+    Returns:
+        Returns the Signed URLs, in the same order as the given URLs.
+    """
+    key = _load_ed25519_key(base64_key)
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+    return [_sign_one(url, key, expiration_timestamp, key_name) for url in urls]
+
+
+def _sign_one(url: str, key: ed25519.Ed25519PrivateKey, expiration_timestamp: int, key_name: str) -> str:
     stripped_url = url.strip()
     parsed_url = urllib.parse.urlsplit(stripped_url)
-    query_params = urllib.parse.parse_qs(
-        parsed_url.query, keep_blank_values=True)
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
-
-    url_pattern = u'{url}{separator}Expires={expires}&KeyName={key_name}'
-
-    url_to_sign = url_pattern.format(
-            url=stripped_url,
-            separator='&' if query_params else '?',
-            expires=expiration_timestamp,
-            key_name=key_name)
-
-    digest = ed25519.Ed25519PrivateKey.from_private_bytes(
-        decoded_key).sign(url_to_sign.encode('utf-8'))
+
+    separator = '&' if parsed_url.query else '?'
+    url_to_sign = f'{stripped_url}{separator}Expires={expiration_timestamp}&KeyName={key_name}'
+
+    digest = key.sign(url_to_sign.encode('utf-8'))
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
-    signed_url = u'{url}&Signature={signature}'.format(
-            url=url_to_sign, signature=signature)
 
-    return signed_url
+    return f'{url_to_sign}&Signature={signature}'
 
 
 def sign_url_prefix(url: str, url_prefix, key_name: str, base64_key: str, expiration_time: datetime.datetime) -> str:
@@ -90,29 +113,16 @@ def sign_url_prefix(url: str, url_prefix, key_name: str, base64_key: str, expira
     """
     stripped_url = url.strip()
     parsed_url = urllib.parse.urlsplit(stripped_url)
-    query_params = urllib.parse.parse_qs(
-        parsed_url.query, keep_blank_values=True)
     encoded_url_prefix = base64.urlsafe_b64encode(
             url_prefix.strip().encode('utf-8')).decode('utf-8')
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
-
-    policy_pattern = u'URLPrefix={encoded_url_prefix}&Expires={expires}&KeyName={key_name}'
-    policy = policy_pattern.format(
-            encoded_url_prefix=encoded_url_prefix,
-            expires=expiration_timestamp,
-            key_name=key_name)
-
-    digest = ed25519.Ed25519PrivateKey.from_private_bytes(
-        decoded_key).sign(policy.encode('utf-8'))
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+
+    policy = f'URLPrefix={encoded_url_prefix}&Expires={expiration_timestamp}&KeyName={key_name}'
+
+    digest = _load_ed25519_key(base64_key).sign(policy.encode('utf-8'))
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
-    signed_url = u'{url}{separator}{policy}&Signature={signature}'.format(
-            url=stripped_url,
-            separator='&' if query_params else '?',
-            policy=policy,
-            signature=signature)
-    return signed_url
+    separator = '&' if parsed_url.query else '?'
+    return f'{stripped_url}{separator}{policy}&Signature={signature}'
 # [END mediacdn_sign_url]
 
 
@@ -131,21 +141,12 @@ def sign_cookie(url_prefix: str, key_name: str, base64_key: str, expiration_time
     """
     encoded_url_prefix = base64.urlsafe_b64encode(
             url_prefix.strip().encode('utf-8')).decode('utf-8')
-    epoch = datetime.datetime.utcfromtimestamp(0)
-    expiration_timestamp = int((expiration_time - epoch).total_seconds())
-    decoded_key = base64.urlsafe_b64decode(base64_key)
-
-    policy_pattern = u'URLPrefix={encoded_url_prefix}:Expires={expires}:KeyName={key_name}'
-    policy = policy_pattern.format(
-            encoded_url_prefix=encoded_url_prefix,
-            expires=expiration_timestamp,
-            key_name=key_name)
-
-    digest = ed25519.Ed25519PrivateKey.from_private_bytes(
-        decoded_key).sign(policy.encode('utf-8'))
+    expiration_timestamp = int((expiration_time - _EPOCH).total_seconds())
+
+    policy = f'URLPrefix={encoded_url_prefix}:Expires={expiration_timestamp}:KeyName={key_name}'
+
+    digest = _load_ed25519_key(base64_key).sign(policy.encode('utf-8'))
     signature = base64.urlsafe_b64encode(digest).decode('utf-8')
 
-    signed_policy = u'Edge-Cache-Cookie={policy}:Signature={signature}'.format(
-            policy=policy, signature=signature)
-    return signed_policy
+    return f'Edge-Cache-Cookie={policy}:Signature={signature}'
 # [END mediacdn_sign_cookie]
@@ -54,6 +54,30 @@ def test_sign_url(capsys: pytest.LogCaptureFixture) -> None:
         '1650848400&KeyName=my-key&Signature=Li_D6rxUh1Kj54JbmUuAms2wmjJHJUcMXJHgYxjL4LqYH02wSX-4gCayXgklNSDpfBfSHnbdC_wvcdyXvADGDw==')
 
 
+def test_sign_urls_batch(capsys: pytest.LogCaptureFixture) -> None:
+    urls = [
+        'http://35.186.234.33/index.html',
+        'http://www.example.com/',
+        'http://www.example.com/some/path?some=query&another=param',
+    ]
+    results = snippets.sign_urls_batch(
+        urls,
+        'my-key',
+        'BxwXXNjeGaoWqjr7GHEymRJkP4SaOC12dTGixk7Yr8I=',
+        datetime.datetime.utcfromtimestamp(EPOCH_TIME))
+    assert results == [
+        snippets.sign_url(
+            url,
+            'my-key',
+            'BxwXXNjeGaoWqjr7GHEymRJkP4SaOC12dTGixk7Yr8I=',
+            datetime.datetime.utcfromtimestamp(EPOCH_TIME))
+        for url in urls
+    ]
+    assert results[1] == (
+        'http://www.example.com/?Expires=1650848400&KeyName=my-key&'
+        'Signature=QhWcq48iCRTJFayWexw929QRxjOxE8ZPSQ38ybTxLhu77hmS_JB6GSougMu_-ejS_ZiGguqxT-HfgSFuy3f5DQ==')
+
+
 def test_sign_url_prefix(capsys: pytest.LogCaptureFixture) -> None:
     results = []
     results.append(snippets.sign_url_prefix(